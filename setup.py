@@ -3,7 +3,7 @@
 Setup script for YUV NV12 Image Converter
 """
 
-from setuptools import setup, find_packages
+from setuptools import setup, find_packages, Extension
 import os
 
 # Read README for long description
@@ -24,11 +24,26 @@ setup(
     author_email='your.email@example.com',
     url='https://github.com/yourusername/yuv-nv12-converter',
     packages=find_packages(exclude=['tests', 'tests.*', 'examples', 'examples.*']),
+    ext_modules=[
+        # Optional: if the compiler is unavailable the NumPy/Numba paths are used
+        Extension(
+            'yuv_nv12._nv12_rgb_avx2',
+            sources=['yuv_nv12/_nv12_rgb_avx2.c'],
+            extra_compile_args=['-O3'],
+            optional=True,
+        ),
+    ],
     python_requires='>=3.7',
     install_requires=[
         'Pillow>=10.0.0',
         'numpy>=1.24.0',
     ],
+    extras_require={
+        'numba': ['numba>=0.57.0'],
+        'cuda': ['cupy>=12.0.0'],
+        'jpeg': ['PyTurboJPEG>=1.6.0'],
+        'opencv': ['opencv-python-headless>=4.5.0'],
+    },
     entry_points={
         'console_scripts': [
             'yuv-convert=yuv_nv12.cli.convert:main',
@@ -4,6 +4,7 @@ Test script for YUV NV12 converter and reader.
 Creates a test image, converts it to YUV, and reads it back.
 """
 
+from contextlib import contextmanager
 from PIL import Image, ImageDraw
 import os
 import sys
@@ -38,6 +39,38 @@ def create_test_image(width=640, height=480, filename='test_image.png'):
     return filename
 
 
+@contextmanager
+def removing(*names):
+    """Remove the given files on exit, whether or not the test passed."""
+    try:
+        yield
+    finally:
+        for name in names:
+            if os.path.exists(name):
+                os.remove(name)
+
+
+@contextmanager
+def nv12_test_file(prefix, num_frames=1, width=64, height=48):
+    """
+    Convert a test image to NV12 and write num_frames copies of the frame.
+
+    Yields the paths of the single-frame file (<prefix>_frame.yuv) and the
+    multi-frame file (<prefix>.yuv); the image and both files are removed
+    on exit.
+    """
+    from yuv_nv12 import convert_to_nv12
+
+    png, frame_yuv, yuv = f'{prefix}.png', f'{prefix}_frame.yuv', f'{prefix}.yuv'
+    with removing(png, frame_yuv, yuv):
+        convert_to_nv12(create_test_image(width, height, png), frame_yuv)
+        with open(frame_yuv, 'rb') as f:
+            frame = f.read()
+        with open(yuv, 'wb') as f:
+            f.write(frame * num_frames)
+        yield frame_yuv, yuv
+
+
 def test_conversion():
     """Test the complete conversion workflow."""
     print("\n=== YUV NV12 Converter Test ===\n")
@@ -122,12 +155,383 @@ def test_odd_dimensions():
         return False
 
 
+def test_float_conversion():
+    """Test rgb_to_yuv_bt601 against the reference BT.601 formula."""
+    print("\n=== Testing Float RGB to YUV Conversion ===\n")
+
+    try:
+        import numpy as np
+        from yuv_nv12 import rgb_to_yuv_bt601
+
+        rgb = np.random.default_rng(0).integers(0, 256, (3, 1 << 20), dtype=np.uint8)
+        for dtype in (np.uint8, np.int64, np.float32):
+            r, g, b = rgb.astype(dtype)
+            expected = (
+                0.299 * r + 0.587 * g + 0.114 * b,
+                -0.168736 * r - 0.331264 * g + 0.5 * b + 128,
+                0.5 * r - 0.418688 * g - 0.081312 * b + 128,
+            )
+            for name, got, ref in zip('YUV', rgb_to_yuv_bt601(r, g, b), expected):
+                if not np.array_equal(got, np.clip(ref, 0, 255).astype(np.uint8)):
+                    print(f"✗ {name} differs from reference for {np.dtype(dtype)} input!")
+                    return False
+
+        print("✓ Matches reference formula for uint8, int64 and float32 inputs")
+        return True
+
+    except Exception as e:
+        print(f"✗ Unexpected error: {e}")
+        return False
+
+
+def test_stream():
+    """Test reading a multi-frame NV12 file frame by frame."""
+    print("\n=== Testing Multi-Frame Stream Reading ===\n")
+
+    try:
+        import numpy as np
+        from yuv_nv12 import read_nv12, read_nv12_stream
+
+        with nv12_test_file('test_stream', num_frames=3) as (frame_yuv, yuv):
+            expected = np.asarray(read_nv12(frame_yuv, 64, 48))
+            frames = list(read_nv12_stream(yuv, 64, 48, max_workers=2))
+
+        if len(frames) != 3:
+            print(f"✗ Expected 3 frames, got {len(frames)}")
+            return False
+        if not all(np.array_equal(np.asarray(img), expected) for img in frames):
+            print("✗ Stream frames differ from single-frame read!")
+            return False
+
+        print(f"✓ Read {len(frames)} frames from stream")
+        return True
+
+    except Exception as e:
+        print(f"✗ Unexpected error: {e}")
+        return False
+
+
+def test_batch():
+    """Test reading a multi-frame NV12 file into one array."""
+    print("\n=== Testing Batched Frame Reading ===\n")
+
+    try:
+        import numpy as np
+        from yuv_nv12 import read_nv12, read_nv12_batch
+
+        with nv12_test_file('test_batch', num_frames=4) as (frame_yuv, yuv):
+            expected = read_nv12(frame_yuv, 64, 48, as_array=True)
+            frames = read_nv12_batch(yuv, 64, 48)
+
+        if frames.shape != (4, 48, 64, 3):
+            print(f"✗ Unexpected batch shape: {frames.shape}")
+            return False
+        if not all(np.array_equal(rgb, expected) for rgb in frames):
+            print("✗ Batch frames differ from single-frame read!")
+            return False
+
+        print(f"✓ Read batch of shape {frames.shape}")
+        return True
+
+    except Exception as e:
+        print(f"✗ Unexpected error: {e}")
+        return False
+
+
+def test_rgba_read():
+    """Test reading an NV12 file as RGBA."""
+    print("\n=== Testing RGBA Reading ===\n")
+
+    try:
+        import numpy as np
+        from yuv_nv12 import read_nv12
+
+        with nv12_test_file('test_rgba') as (yuv, _):
+            rgb = read_nv12(yuv, 64, 48, as_array=True)
+            rgba = read_nv12(yuv, 64, 48, mode='RGBA', as_array=True)
+
+        if rgba.shape != (48, 64, 4):
+            print(f"✗ Unexpected RGBA shape: {rgba.shape}")
+            return False
+        if not (rgba[..., 3] == 255).all():
+            print("✗ Alpha channel is not fully opaque!")
+            return False
+        if not np.array_equal(rgba[..., :3], rgb):
+            print("✗ RGBA color channels differ from RGB read!")
+            return False
+
+        print(f"✓ Read RGBA array of shape {rgba.shape}")
+        return True
+
+    except Exception as e:
+        print(f"✗ Unexpected error: {e}")
+        return False
+
+
+def test_rgba_conversion():
+    """Test that an RGBA image converts like the same pixels saved as RGB."""
+    print("\n=== Testing RGBA Image Conversion ===\n")
+
+    files = ['test_rgba_src.png', 'test_rgba_src_rgb.png',
+             'test_rgba_src.yuv', 'test_rgba_src_rgb.yuv']
+    try:
+        from yuv_nv12 import convert_to_nv12
+
+        with removing(*files):
+            # Semi-transparent copy of the stripes; alpha must not affect NV12
+            test_img = create_test_image(64, 48, 'test_rgba_src_rgb.png')
+            rgba = Image.open(test_img).convert('RGBA')
+            rgba.putalpha(Image.linear_gradient('L').resize(rgba.size))
+            rgba.save('test_rgba_src.png')
+
+            convert_to_nv12('test_rgba_src.png', 'test_rgba_src.yuv')
+            convert_to_nv12('test_rgba_src_rgb.png', 'test_rgba_src_rgb.yuv')
+            with open('test_rgba_src.yuv', 'rb') as f:
+                from_rgba = f.read()
+            with open('test_rgba_src_rgb.yuv', 'rb') as f:
+                from_rgb = f.read()
+
+        if from_rgba != from_rgb:
+            print("✗ RGBA input produced different NV12 bytes than RGB input!")
+            return False
+
+        print("✓ RGBA and RGB inputs produce identical NV12")
+        return True
+
+    except Exception as e:
+        print(f"✗ Unexpected error: {e}")
+        return False
+
+
+def test_read_backends():
+    """Test that every NV12 read backend produces identical pixels."""
+    print("\n=== Testing Read Backend Parity ===\n")
+
+    try:
+        from yuv_nv12 import reader, _kernels
+    except ImportError as e:
+        print(f"✗ Failed to import modules: {e}")
+        return False
+
+    saved = (reader._nv12_rgb_avx2, _kernels.nv12_to_rgb, os.cpu_count)
+    try:
+        import numpy as np
+
+        # Pretend to have 4 CPUs so the 128-row frame is split into NumPy
+        # stripes; decoders built earlier would keep their old stripe layout
+        os.cpu_count = lambda: 4
+        reader._make_nv12_decoder.cache_clear()
+
+        rng = np.random.default_rng(0)
+        # Widths that are not multiples of 16 exercise the scalar tails
+        frames = {(w, h): rng.integers(0, 256, w * h * 3 // 2, dtype=np.uint8)
+                  for w, h in ((18, 10), (34, 10), (34, 128))}
+
+        def decode_all():
+            return [reader._nv12_to_rgb_array(buf, w, h, channels, parallel)
+                    for (w, h), buf in frames.items()
+                    for channels in (3, 4)
+                    for parallel in (True, False)]
+
+        results = {'default': decode_all()}
+        reader._nv12_rgb_avx2 = None
+        results['numba'] = decode_all()
+        _kernels.nv12_to_rgb = None
+        results['numpy'] = decode_all()
+
+        for name, outputs in results.items():
+            if not all(np.array_equal(a, b)
+                       for a, b in zip(outputs, results['numpy'])):
+                print(f"✗ {name} backend differs from NumPy path!")
+                return False
+
+        print(f"✓ Backends agree: {', '.join(results)}")
+        return True
+
+    except Exception as e:
+        print(f"✗ Unexpected error: {e}")
+        return False
+
+    finally:
+        reader._nv12_rgb_avx2, _kernels.nv12_to_rgb, os.cpu_count = saved
+        reader._make_nv12_decoder.cache_clear()
+
+
+def test_convert_backends():
+    """Test that every NV12 convert backend writes identical bytes."""
+    print("\n=== Testing Convert Backend Parity ===\n")
+
+    try:
+        from yuv_nv12 import converter, _kernels
+    except ImportError as e:
+        print(f"✗ Failed to import modules: {e}")
+        return False
+
+    saved = (converter._nv12_rgb_avx2, _kernels.rgb_to_nv12)
+    files = ['test_backend_rgb.png', 'test_backend_rgba.png', 'test_backend.yuv']
+    try:
+        import numpy as np
+
+        def convert_all():
+            outputs = []
+            for name in files[:2]:
+                converter.convert_to_nv12(name, files[2])
+                with open(files[2], 'rb') as f:
+                    outputs.append(f.read())
+            return outputs
+
+        with removing(*files):
+            rng = np.random.default_rng(0)
+            for mode, name in (('RGB', files[0]), ('RGBA', files[1])):
+                pixels = rng.integers(0, 256, (10, 34, len(mode)), dtype=np.uint8)
+                Image.fromarray(pixels, mode).save(name)
+
+            results = {'default': convert_all()}
+            converter._nv12_rgb_avx2 = None
+            results['numba'] = convert_all()
+            _kernels.rgb_to_nv12 = None
+            results['numpy'] = convert_all()
+
+        for name, outputs in results.items():
+            if outputs != results['numpy']:
+                print(f"✗ {name} backend differs from NumPy path!")
+                return False
+
+        print(f"✓ Backends agree: {', '.join(results)}")
+        return True
+
+    except Exception as e:
+        print(f"✗ Unexpected error: {e}")
+        return False
+
+    finally:
+        converter._nv12_rgb_avx2, _kernels.rgb_to_nv12 = saved
+
+
+def test_opencv_png():
+    """Test that only PNG output goes through OpenCV, at PIL's zlib level."""
+    print("\n=== Testing OpenCV PNG Output ===\n")
+
+    try:
+        from yuv_nv12 import reader
+    except ImportError as e:
+        print(f"✗ Failed to import modules: {e}")
+        return False
+
+    saved = reader._get_cv2
+    outputs = ['test_cv2_out.png', 'test_cv2_out.bmp']
+    try:
+        import numpy as np
+        from types import SimpleNamespace
+
+        # Stand-in for cv2 that records imwrite calls and saves through PIL
+        calls = []
+
+        def imwrite(path, bgr, params):
+            calls.append((path, params))
+            Image.fromarray(np.ascontiguousarray(bgr[..., ::-1])).save(path)
+            return True
+
+        reader._get_cv2 = lambda: SimpleNamespace(
+            COLOR_RGB2BGR=4, IMWRITE_PNG_COMPRESSION=16, error=RuntimeError,
+            cvtColor=lambda rgb, code: rgb[..., ::-1], imwrite=imwrite)
+
+        with nv12_test_file('test_cv2') as (yuv, _), removing(*outputs):
+            expected = reader.read_nv12(yuv, 64, 48, as_array=True)
+            written = []
+            for name in outputs:
+                reader.visualize_nv12(yuv, 64, 48, name, show=False)
+                written.append(np.asarray(Image.open(name)))
+
+        if calls != [('test_cv2_out.png', [16, 6])]:
+            print(f"✗ Unexpected OpenCV calls: {calls}")
+            return False
+        for name, rgb in zip(outputs, written):
+            if not np.array_equal(rgb, expected):
+                print(f"✗ {name} differs from the decoded frame!")
+                return False
+
+        print("✓ PNG written through OpenCV at level 6, BMP through PIL")
+        return True
+
+    except Exception as e:
+        print(f"✗ Unexpected error: {e}")
+        return False
+
+    finally:
+        reader._get_cv2 = saved
+
+
+def test_jpeg_from_nv12():
+    """Test that JPEG output hands the NV12 planes to the encoder as I420."""
+    print("\n=== Testing JPEG Output from NV12 ===\n")
+
+    try:
+        from yuv_nv12 import reader
+    except ImportError as e:
+        print(f"✗ Failed to import modules: {e}")
+        return False
+
+    saved = reader._get_turbojpeg
+    try:
+        import numpy as np
+
+        # Stub encoder that records its input instead of compressing it
+        class StubJPEG:
+            def encode_from_yuv(self, i420, height, width, quality, jpeg_subsample):
+                self.args = (i420, height, width, quality)
+                return b'stub jpeg'
+
+        stub = StubJPEG()
+        reader._get_turbojpeg = lambda: stub
+
+        with nv12_test_file('test_jpeg') as (yuv, _), removing('test_jpeg_out.jpg'):
+            img = reader.visualize_nv12(yuv, 64, 48, 'test_jpeg_out.jpg', show=False)
+            expected = reader.read_nv12(yuv, 64, 48, as_array=True)
+            nv12 = np.fromfile(yuv, dtype=np.uint8)
+            with open('test_jpeg_out.jpg', 'rb') as f:
+                jpeg = f.read()
+
+        uv = nv12[64 * 48:].reshape((24, 32, 2))
+        i420 = np.concatenate((nv12[:64 * 48], uv[..., 0].ravel(), uv[..., 1].ravel()))
+        i420_in, height, width, quality = stub.args
+
+        if not np.array_equal(i420_in, i420) or (height, width, quality) != (48, 64, 75):
+            print("✗ Encoder did not receive the I420 planes at quality 75!")
+            return False
+        if jpeg != b'stub jpeg':
+            print("✗ JPEG file was not written from the encoder output!")
+            return False
+        if not np.array_equal(np.asarray(img), expected):
+            print("✗ Returned image differs from the decoded frame!")
+            return False
+
+        print("✓ JPEG encoded from the NV12 planes")
+        return True
+
+    except Exception as e:
+        print(f"✗ Unexpected error: {e}")
+        return False
+
+    finally:
+        reader._get_turbojpeg = saved
+
+
 if __name__ == '__main__':
     success = True
 
     # Run tests
     success &= test_conversion()
     success &= test_odd_dimensions()
+    success &= test_float_conversion()
+    success &= test_stream()
+    success &= test_batch()
+    success &= test_rgba_read()
+    success &= test_rgba_conversion()
+    success &= test_read_backends()
+    success &= test_convert_backends()
+    success &= test_opencv_png()
+    success &= test_jpeg_from_nv12()
 
     print("\n" + "="*50)
     if success:
@@ -8,12 +8,17 @@ from .converter import (
     convert_to_nv12,
     validate_dimensions,
     rgb_to_yuv_bt601,
+    rgb_to_yuv_bt601_fast,
+    rgb_to_y_bt601,
+    rgb_to_uv_bt601,
     DimensionError,
     get_file_info
 )
 
 from .reader import (
     read_nv12,
+    read_nv12_stream,
+    read_nv12_batch,
     visualize_nv12,
     yuv_to_rgb_bt601,
     get_nv12_info
@@ -25,10 +30,15 @@ __all__ = [
     'convert_to_nv12',
     'validate_dimensions',
     'rgb_to_yuv_bt601',
+    'rgb_to_yuv_bt601_fast',
+    'rgb_to_y_bt601',
+    'rgb_to_uv_bt601',
     'DimensionError',
     'get_file_info',
     # Reader functions
     'read_nv12',
+    'read_nv12_stream',
+    'read_nv12_batch',
     'visualize_nv12',
     'yuv_to_rgb_bt601',
     'get_nv12_info',
@@ -0,0 +1,56 @@
+"""
+YUV NV12 Numba Kernels
+
+Fused, JIT-compiled conversion loops for both directions (NV12 <-> RGB).
+Numba is optional: without it every kernel is None and callers use their
+NumPy paths instead.
+
+The kernels live in _kernels_numba and are imported on first access, so
+importing the package (and every run that uses the C extension) doesn't
+pay for importing Numba.
+"""
+
+import threading
+import numpy as np
+
+
+# Numba's default (workqueue) threading layer aborts the process when
+# parallel kernels are launched from several threads at once, so callers
+# hold this lock around every parallel=True kernel launch
+parallel_lock = threading.Lock()
+
+# BT.601 full range YUV -> RGB coefficients in Q16 fixed point
+_Q16_SHIFT = 16
+_Q16_ROUND = 1 << (_Q16_SHIFT - 1)
+_Q16_R_V = 91881     # 1.402
+_Q16_G_U = -22554    # -0.344136
+_Q16_G_V = -46802    # -0.714136
+_Q16_B_U = 116130    # 1.772
+
+# Per-value chroma contribution tables (Q16), indexed by the raw uint8
+# sample. The rounding term is folded into the R, B and G/V tables, so a
+# channel offset is just (sum of table entries) >> _Q16_SHIFT.
+_LUT_R_V = (np.arange(256, dtype=np.int32) - 128) * _Q16_R_V + _Q16_ROUND
+_LUT_G_U = (np.arange(256, dtype=np.int32) - 128) * _Q16_G_U
+_LUT_G_V = (np.arange(256, dtype=np.int32) - 128) * _Q16_G_V + _Q16_ROUND
+_LUT_B_U = (np.arange(256, dtype=np.int32) - 128) * _Q16_B_U + _Q16_ROUND
+
+
+# Kernels resolved by __getattr__ on first access
+_KERNELS = ('nv12_to_rgb', 'nv12_to_rgb_batch', 'nv12_to_rgb_serial', 'rgb_to_nv12')
+
+
+def __getattr__(name):
+    """Import the Numba kernels on first use; each is None without Numba."""
+    if name not in _KERNELS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    try:
+        from . import _kernels_numba as kernels
+    except ImportError:  # numba is optional; callers fall back to NumPy
+        kernels = None
+
+    # setdefault keeps any kernel a caller has already replaced
+    for kernel in _KERNELS:
+        globals().setdefault(kernel, getattr(kernels, kernel, None))
+    return globals()[name]
@@ -0,0 +1,126 @@
+"""
+YUV NV12 Numba Kernels (implementation)
+
+Imported lazily through _kernels, which also holds the Q16 constants and
+lookup tables used here. Importing this module fails without Numba.
+"""
+
+import numba
+import numpy as np
+
+from ._kernels import _Q16_SHIFT, _LUT_R_V, _LUT_G_U, _LUT_G_V, _LUT_B_U
+
+
+@numba.njit(inline='always', fastmath=True, nogil=True)
+def _nv12_row_to_rgb(Y, uv_data, out, ci):
+    """
+    Convert chroma row ci (image rows 2*ci and 2*ci + 1) of one frame.
+
+    Each chroma sample is turned into R/G/B offsets once (from the module
+    level lookup tables) and added to the four 8-bit Y samples of its
+    2x2 block. Inlined into every NV12 -> RGB kernel below.
+    """
+    alpha = out.shape[2] == 4
+    for cj in range(0, Y.shape[1], 2):
+        # One chroma sample covers a 2x2 block of Y
+        u = uv_data[ci, cj]
+        v = uv_data[ci, cj + 1]
+        rd = _LUT_R_V[v] >> _Q16_SHIFT
+        gd = (_LUT_G_U[u] + _LUT_G_V[v]) >> _Q16_SHIFT
+        bd = _LUT_B_U[u] >> _Q16_SHIFT
+
+        for i in range(2 * ci, 2 * ci + 2):
+            for j in range(cj, cj + 2):
+                y = np.int32(Y[i, j])
+                out[i, j, 0] = min(max(y + rd, 0), 255)
+                out[i, j, 1] = min(max(y + gd, 0), 255)
+                out[i, j, 2] = min(max(y + bd, 0), 255)
+                if alpha:
+                    out[i, j, 3] = 255
+
+
+@numba.njit(parallel=True, fastmath=True, cache=True, nogil=True)
+def nv12_to_rgb(Y, uv_data, out):
+    """
+    Fused NV12 -> interleaved RGB kernel.
+
+    Reads the half resolution UV plane directly and writes every output
+    pixel in a single pass, one chroma row (two image rows) per task.
+
+    Args:
+        Y: Y plane (height x width, uint8)
+        uv_data: Interleaved UV plane (height/2 x width, uint8)
+        out: Preallocated RGB(A) output (height x width x 3 or 4, uint8);
+             with 4 channels alpha is set to 255
+    """
+    for ci in numba.prange(Y.shape[0] >> 1):
+        _nv12_row_to_rgb(Y, uv_data, out, ci)
+
+
+@numba.njit(parallel=True, fastmath=True, cache=True, nogil=True)
+def nv12_to_rgb_batch(Y, uv_data, out):
+    """
+    nv12_to_rgb over a batch of frames in a single parallel launch.
+
+    The frame and chroma row loops are flattened into one prange, so the
+    work of all frames is shared by the thread pool at once.
+
+    Args:
+        Y: Y planes (frames x height x width, uint8)
+        uv_data: Interleaved UV planes (frames x height/2 x width, uint8)
+        out: Preallocated RGB(A) output (frames x height x width x 3 or 4,
+             uint8); with 4 channels alpha is set to 255
+    """
+    num_frames = Y.shape[0]
+    uv_height = Y.shape[1] >> 1
+    for k in numba.prange(num_frames * uv_height):
+        n = k // uv_height
+        _nv12_row_to_rgb(Y[n], uv_data[n], out[n], k - n * uv_height)
+
+
+@numba.njit(fastmath=True, cache=True, nogil=True)
+def nv12_to_rgb_serial(Y, uv_data, out):
+    """
+    Single-threaded nv12_to_rgb.
+
+    Used for multi-frame reads, where frames are converted concurrently
+    (the default Numba threading layer can't launch the parallel kernel
+    from several threads). The frame size is taken from the arguments,
+    so one cached compilation serves every size.
+    """
+    for ci in range(Y.shape[0] >> 1):
+        _nv12_row_to_rgb(Y, uv_data, out, ci)
+
+
+@numba.njit(parallel=True, fastmath=True, cache=True, nogil=True)
+def rgb_to_nv12(rgb, Y_out, uv_out):
+    """
+    Fused RGB -> NV12 kernel (inverse of nv12_to_rgb).
+
+    Computes Y for every pixel and U/V once per 2x2 block (from its
+    top-left pixel) in a single pass, with the same 8-bit fixed-point
+    coefficients as converter.rgb_to_yuv_bt601_fast.
+
+    Args:
+        rgb: RGB input (height x width x 3 or more, uint8); channels
+             past the third are ignored
+        Y_out: Preallocated Y plane (height x width, uint8)
+        uv_out: Preallocated interleaved UV plane (height/2 x width/2 x 2, uint8)
+    """
+    height, width = Y_out.shape
+    for ci in numba.prange(height >> 1):
+        for i in range(2 * ci, 2 * ci + 2):
+            for j in range(width):
+                r = np.int32(rgb[i, j, 0])
+                g = np.int32(rgb[i, j, 1])
+                b = np.int32(rgb[i, j, 2])
+                Y_out[i, j] = (77 * r + 150 * g + 29 * b + 128) >> 8
+
+        # Point-subsampled chroma from the top-left pixel of each block
+        for cj in range(width >> 1):
+            r = np.int32(rgb[2 * ci, 2 * cj, 0])
+            g = np.int32(rgb[2 * ci, 2 * cj, 1])
+            b = np.int32(rgb[2 * ci, 2 * cj, 2])
+            # +128 bias folded in; numerators lie in [255, 65535]
+            uv_out[ci, cj, 0] = (128 * b + 32895 - 43 * r - 85 * g) >> 8
+            uv_out[ci, cj, 1] = (128 * r + 32895 - 107 * g - 21 * b) >> 8
@@ -0,0 +1,368 @@
+/*
+ * NV12 <-> interleaved RGB/RGBA conversion (BT.601 full range).
+ *
+ * Uses the same fixed-point coefficients as yuv_nv12/_kernels.py and
+ * yuv_nv12/converter.py, so the output is bit-identical to the NumPy and
+ * Numba paths in both directions. Rows are processed in pairs that share one
+ * line of chroma. For NV12 -> RGB on x86 CPUs with AVX2 the inner loop
+ * handles 16 pixels per iteration, the remainder runs scalar. RGB -> NV12 is
+ * plain C written so that the compiler can vectorize it (-O3) on any target.
+ */
+
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+#include <stdint.h>
+
+#if defined(__GNUC__) && (defined(__x86_64__) || defined(__i386__))
+#define NV12_HAVE_AVX2 1
+#include <immintrin.h>
+#endif
+
+#define Q16_SHIFT 16
+#define Q16_ROUND (1 << (Q16_SHIFT - 1))
+#define Q16_R_V 91881     /* 1.402 */
+#define Q16_G_U -22554    /* -0.344136 */
+#define Q16_G_V -46802    /* -0.714136 */
+#define Q16_B_U 116130    /* 1.772 */
+
+static inline uint8_t clamp_u8(int x)
+{
+    return (uint8_t)(x < 0 ? 0 : (x > 255 ? 255 : x));
+}
+
+/* Convert pixels [x, width) of a row pair sharing one chroma line (cn = 3 or 4). */
+static void nv12_span_scalar(const uint8_t *y0, const uint8_t *y1, const uint8_t *uv,
+                             uint8_t *out0, uint8_t *out1, int x, int width, int cn)
+{
+    for (; x < width; x += 2) {
+        int u = uv[x] - 128;
+        int v = uv[x + 1] - 128;
+        int rd = (Q16_R_V * v + Q16_ROUND) >> Q16_SHIFT;
+        int gd = (Q16_G_U * u + Q16_G_V * v + Q16_ROUND) >> Q16_SHIFT;
+        int bd = (Q16_B_U * u + Q16_ROUND) >> Q16_SHIFT;
+        int k;
+
+        for (k = x; k < x + 2; k++) {
+            uint8_t *p0 = out0 + (size_t)k * cn;
+            uint8_t *p1 = out1 + (size_t)k * cn;
+            p0[0] = clamp_u8(y0[k] + rd);
+            p0[1] = clamp_u8(y0[k] + gd);
+            p0[2] = clamp_u8(y0[k] + bd);
+            p1[0] = clamp_u8(y1[k] + rd);
+            p1[1] = clamp_u8(y1[k] + gd);
+            p1[2] = clamp_u8(y1[k] + bd);
+            if (cn == 4)
+                p0[3] = p1[3] = 255;
+        }
+    }
+}
+
+#ifdef NV12_HAVE_AVX2
+
+/* Widen 8 int32 chroma deltas to 16 int16 lanes, one per pixel (d0 d0 d1 d1 ...). */
+__attribute__((target("avx2")))
+static inline __m256i dup_delta(__m256i d)
+{
+    return _mm256_or_si256(_mm256_slli_epi32(d, 16),
+                           _mm256_and_si256(d, _mm256_set1_epi32(0xffff)));
+}
+
+/* Add deltas to 16 Y samples and saturate to uint8, one vector per channel. */
+__attribute__((target("avx2")))
+static inline void pack_rgb16(const uint8_t *y, __m256i rd, __m256i gd, __m256i bd,
+                              __m128i *r, __m128i *g, __m128i *b)
+{
+    __m256i y16 = _mm256_cvtepu8_epi16(_mm_loadu_si128((const __m128i *)y));
+    __m256i rg = _mm256_packus_epi16(_mm256_adds_epi16(y16, rd), _mm256_adds_epi16(y16, gd));
+    __m256i bb = _mm256_packus_epi16(_mm256_adds_epi16(y16, bd), _mm256_setzero_si256());
+
+    /* packus works per 128-bit lane; gather the qwords back into pixel order */
+    rg = _mm256_permute4x64_epi64(rg, _MM_SHUFFLE(3, 1, 2, 0));
+    bb = _mm256_permute4x64_epi64(bb, _MM_SHUFFLE(3, 1, 2, 0));
+    *r = _mm256_castsi256_si128(rg);
+    *g = _mm256_extracti128_si256(rg, 1);
+    *b = _mm256_castsi256_si128(bb);
+}
+
+/* Store 16 pixels as 48 interleaved RGB bytes. */
+__attribute__((target("avx2")))
+static inline void store_rgb16(const uint8_t *y, __m256i rd, __m256i gd, __m256i bd, uint8_t *out)
+{
+    __m128i r, g, b;
+
+    pack_rgb16(y, rd, gd, bd, &r, &g, &b);
+    _mm_storeu_si128((__m128i *)out, _mm_or_si128(_mm_or_si128(
+        _mm_shuffle_epi8(r, _mm_setr_epi8(0, -1, -1, 1, -1, -1, 2, -1, -1, 3, -1, -1, 4, -1, -1, 5)),
+        _mm_shuffle_epi8(g, _mm_setr_epi8(-1, 0, -1, -1, 1, -1, -1, 2, -1, -1, 3, -1, -1, 4, -1, -1))),
+        _mm_shuffle_epi8(b, _mm_setr_epi8(-1, -1, 0, -1, -1, 1, -1, -1, 2, -1, -1, 3, -1, -1, 4, -1))));
+    _mm_storeu_si128((__m128i *)(out + 16), _mm_or_si128(_mm_or_si128(
+        _mm_shuffle_epi8(r, _mm_setr_epi8(-1, -1, 6, -1, -1, 7, -1, -1, 8, -1, -1, 9, -1, -1, 10, -1)),
+        _mm_shuffle_epi8(g, _mm_setr_epi8(5, -1, -1, 6, -1, -1, 7, -1, -1, 8, -1, -1, 9, -1, -1, 10))),
+        _mm_shuffle_epi8(b, _mm_setr_epi8(-1, 5, -1, -1, 6, -1, -1, 7, -1, -1, 8, -1, -1, 9, -1, -1))));
+    _mm_storeu_si128((__m128i *)(out + 32), _mm_or_si128(_mm_or_si128(
+        _mm_shuffle_epi8(r, _mm_setr_epi8(-1, 11, -1, -1, 12, -1, -1, 13, -1, -1, 14, -1, -1, 15, -1, -1)),
+        _mm_shuffle_epi8(g, _mm_setr_epi8(-1, -1, 11, -1, -1, 12, -1, -1, 13, -1, -1, 14, -1, -1, 15, -1))),
+        _mm_shuffle_epi8(b, _mm_setr_epi8(10, -1, -1, 11, -1, -1, 12, -1, -1, 13, -1, -1, 14, -1, -1, 15))));
+}
+
+/* Store 16 pixels as 64 interleaved RGBA bytes (alpha = 255). */
+__attribute__((target("avx2")))
+static inline void store_rgba16(const uint8_t *y, __m256i rd, __m256i gd, __m256i bd, uint8_t *out)
+{
+    __m128i r, g, b, rg, ba;
+    const __m128i a = _mm_set1_epi8(-1);
+
+    pack_rgb16(y, rd, gd, bd, &r, &g, &b);
+
+    rg = _mm_unpacklo_epi8(r, g);
+    ba = _mm_unpacklo_epi8(b, a);
+    _mm_storeu_si128((__m128i *)out, _mm_unpacklo_epi16(rg, ba));
+    _mm_storeu_si128((__m128i *)(out + 16), _mm_unpackhi_epi16(rg, ba));
+    rg = _mm_unpackhi_epi8(r, g);
+    ba = _mm_unpackhi_epi8(b, a);
+    _mm_storeu_si128((__m128i *)(out + 32), _mm_unpacklo_epi16(rg, ba));
+    _mm_storeu_si128((__m128i *)(out + 48), _mm_unpackhi_epi16(rg, ba));
+}
+
+/*
+ * The Q16 coefficients do not fit in int16, so each product is split across
+ * the two halves of _mm256_madd_epi16 (exact in int32):
+ *   R: v*1     + 4v*22970  = 91881*v
+ *   G: u*-22554 + 2v*-23401 = -22554*u - 46802*v
+ *   B: u*2     + 4u*29032  = 116130*u
+ */
+#define PAIR16(lo, hi) ((int)(((uint32_t)(uint16_t)(hi) << 16) | (uint16_t)(lo)))
+
+__attribute__((target("avx2")))
+static void nv12_to_rgb_avx2(const uint8_t *Y, const uint8_t *UV, uint8_t *rgb, int width, int height, int cn)
+{
+    const __m256i bias = _mm256_set1_epi16(128);
+    const __m256i round = _mm256_set1_epi32(Q16_ROUND);
+    const __m256i mul_r = _mm256_set1_epi32(PAIR16(1, 4));
+    const __m256i mul_g = _mm256_set1_epi32(PAIR16(1, 2));
+    const __m256i mul_b = _mm256_set1_epi32(PAIR16(1, 4));
+    const __m256i coef_r = _mm256_set1_epi32(PAIR16(1, 22970));
+    const __m256i coef_g = _mm256_set1_epi32(PAIR16(-22554, -23401));
+    const __m256i coef_b = _mm256_set1_epi32(PAIR16(2, 29032));
+    const __m256i dup_v = _mm256_setr_epi8(2, 3, 2, 3, 6, 7, 6, 7, 10, 11, 10, 11, 14, 15, 14, 15,
+                                           2, 3, 2, 3, 6, 7, 6, 7, 10, 11, 10, 11, 14, 15, 14, 15);
+    const __m256i dup_u = _mm256_setr_epi8(0, 1, 0, 1, 4, 5, 4, 5, 8, 9, 8, 9, 12, 13, 12, 13,
+                                           0, 1, 0, 1, 4, 5, 4, 5, 8, 9, 8, 9, 12, 13, 12, 13);
+    int row;
+
+    for (row = 0; row < height; row += 2) {
+        const uint8_t *y0 = Y + (size_t)row * width;
+        const uint8_t *y1 = y0 + width;
+        const uint8_t *uv = UV + (size_t)(row >> 1) * width;
+        uint8_t *out0 = rgb + (size_t)row * width * cn;
+        uint8_t *out1 = out0 + (size_t)width * cn;
+        int x = 0;
+
+        for (; x + 16 <= width; x += 16) {
+            /* 8 (u, v) pairs cover 16 pixels: u0 v0 u1 v1 ... as int16 */
+            __m256i uv16 = _mm256_sub_epi16(
+                _mm256_cvtepu8_epi16(_mm_loadu_si128((const __m128i *)(uv + x))), bias);
+            __m256i vv = _mm256_mullo_epi16(_mm256_shuffle_epi8(uv16, dup_v), mul_r);
+            __m256i uv2 = _mm256_mullo_epi16(uv16, mul_g);
+            __m256i uu = _mm256_mullo_epi16(_mm256_shuffle_epi8(uv16, dup_u), mul_b);
+
+            __m256i rd = _mm256_srai_epi32(_mm256_add_epi32(_mm256_madd_epi16(vv, coef_r), round), Q16_SHIFT);
+            __m256i gd = _mm256_srai_epi32(_mm256_add_epi32(_mm256_madd_epi16(uv2, coef_g), round), Q16_SHIFT);
+            __m256i bd = _mm256_srai_epi32(_mm256_add_epi32(_mm256_madd_epi16(uu, coef_b), round), Q16_SHIFT);
+
+            rd = dup_delta(rd);
+            gd = dup_delta(gd);
+            bd = dup_delta(bd);
+
+            if (cn == 4) {
+                store_rgba16(y0 + x, rd, gd, bd, out0 + (size_t)x * 4);
+                store_rgba16(y1 + x, rd, gd, bd, out1 + (size_t)x * 4);
+            } else {
+                store_rgb16(y0 + x, rd, gd, bd, out0 + (size_t)x * 3);
+                store_rgb16(y1 + x, rd, gd, bd, out1 + (size_t)x * 3);
+            }
+        }
+
+        nv12_span_scalar(y0, y1, uv, out0, out1, x, width, cn);
+    }
+}
+
+#endif /* NV12_HAVE_AVX2 */
+
+static void nv12_to_rgb_scalar(const uint8_t *Y, const uint8_t *UV, uint8_t *rgb, int width, int height, int cn)
+{
+    int row;
+
+    for (row = 0; row < height; row += 2) {
+        const uint8_t *y0 = Y + (size_t)row * width;
+        uint8_t *out0 = rgb + (size_t)row * width * cn;
+        nv12_span_scalar(y0, y0 + width, UV + (size_t)(row >> 1) * width,
+                         out0, out0 + (size_t)width * cn, 0, width, cn);
+    }
+}
+
+/*
+ * RGB(A) -> NV12 with the 8-bit coefficients of rgb_to_yuv_bt601_fast. U and
+ * V carry the +128 bias in the numerator ((x + 127) >> 8) + 128 =
+ * (x + 32895) >> 8, which stays within [255, 65535], so no clamping is needed.
+ * Chroma is point-subsampled from the top-left pixel of each 2x2 block.
+ */
+static inline void rgb_to_nv12_rows(const uint8_t *rgb, uint8_t *Y, uint8_t *UV, int width, int height, int cn)
+{
+    int row, x;
+
+    for (row = 0; row < height; row++) {
+        const uint8_t *in = rgb + (size_t)row * width * cn;
+        uint8_t *y = Y + (size_t)row * width;
+
+        for (x = 0; x < width; x++) {
+            const uint8_t *p = in + (size_t)x * cn;
+            y[x] = (uint8_t)((77 * p[0] + 150 * p[1] + 29 * p[2] + 128) >> 8);
+        }
+
+        if (row & 1)
+            continue;
+
+        {
+            uint8_t *uv = UV + (size_t)(row >> 1) * width;
+
+            for (x = 0; x < width; x += 2) {
+                const uint8_t *p = in + (size_t)x * cn;
+                uv[x] = (uint8_t)((128 * p[2] + 32895 - 43 * p[0] - 85 * p[1]) >> 8);
+                uv[x + 1] = (uint8_t)((128 * p[0] + 32895 - 107 * p[1] - 21 * p[2]) >> 8);
+            }
+        }
+    }
+}
+
+/* Instantiate with a constant pixel stride so the row loops vectorize. */
+static void rgb_to_nv12_scalar(const uint8_t *rgb, uint8_t *Y, uint8_t *UV, int width, int height, int cn)
+{
+    if (cn == 4)
+        rgb_to_nv12_rows(rgb, Y, UV, width, height, 4);
+    else
+        rgb_to_nv12_rows(rgb, Y, UV, width, height, 3);
+}
+
+#ifdef NV12_HAVE_AVX2
+/* Same loops, inlined into an AVX2 function so they vectorize 32 bytes wide. */
+__attribute__((target("avx2")))
+static void rgb_to_nv12_avx2(const uint8_t *rgb, uint8_t *Y, uint8_t *UV, int width, int height, int cn)
+{
+    if (cn == 4)
+        rgb_to_nv12_rows(rgb, Y, UV, width, height, 4);
+    else
+        rgb_to_nv12_rows(rgb, Y, UV, width, height, 3);
+}
+#endif
+
+static PyObject *py_nv12_to_rgb(PyObject *self, PyObject *args)
+{
+    Py_buffer y, uv, out;
+    int width, height, cn = 3;
+    PyObject *result = NULL;
+
+    if (!PyArg_ParseTuple(args, "y*y*w*ii|i", &y, &uv, &out, &width, &height, &cn))
+        return NULL;
+
+    if (width <= 0 || height <= 0 || width % 2 != 0 || height % 2 != 0) {
+        PyErr_Format(PyExc_ValueError, "Dimensions must be even numbers. Got %dx%d", width, height);
+        goto done;
+    }
+    if (cn != 3 && cn != 4) {
+        PyErr_Format(PyExc_ValueError, "channels must be 3 or 4. Got %d", cn);
+        goto done;
+    }
+    if (y.len < (Py_ssize_t)width * height || uv.len < (Py_ssize_t)width * (height / 2) ||
+        out.len < (Py_ssize_t)width * height * cn) {
+        PyErr_SetString(PyExc_ValueError, "Buffer too small for the given dimensions");
+        goto done;
+    }
+
+    Py_BEGIN_ALLOW_THREADS
+#ifdef NV12_HAVE_AVX2
+    if (__builtin_cpu_supports("avx2"))
+        nv12_to_rgb_avx2(y.buf, uv.buf, out.buf, width, height, cn);
+    else
+#endif
+        nv12_to_rgb_scalar(y.buf, uv.buf, out.buf, width, height, cn);
+    Py_END_ALLOW_THREADS
+
+    result = Py_None;
+    Py_INCREF(result);
+
+done:
+    PyBuffer_Release(&y);
+    PyBuffer_Release(&uv);
+    PyBuffer_Release(&out);
+    return result;
+}
+
+static PyObject *py_rgb_to_nv12(PyObject *self, PyObject *args)
+{
+    Py_buffer rgb, y, uv;
+    int width, height, cn = 3;
+    PyObject *result = NULL;
+
+    if (!PyArg_ParseTuple(args, "y*w*w*ii|i", &rgb, &y, &uv, &width, &height, &cn))
+        return NULL;
+
+    if (width <= 0 || height <= 0 || width % 2 != 0 || height % 2 != 0) {
+        PyErr_Format(PyExc_ValueError, "Dimensions must be even numbers. Got %dx%d", width, height);
+        goto done;
+    }
+    if (cn != 3 && cn != 4) {
+        PyErr_Format(PyExc_ValueError, "channels must be 3 or 4. Got %d", cn);
+        goto done;
+    }
+    if (rgb.len < (Py_ssize_t)width * height * cn || y.len < (Py_ssize_t)width * height ||
+        uv.len < (Py_ssize_t)width * (height / 2)) {
+        PyErr_SetString(PyExc_ValueError, "Buffer too small for the given dimensions");
+        goto done;
+    }
+
+    Py_BEGIN_ALLOW_THREADS
+#ifdef NV12_HAVE_AVX2
+    if (__builtin_cpu_supports("avx2"))
+        rgb_to_nv12_avx2(rgb.buf, y.buf, uv.buf, width, height, cn);
+    else
+#endif
+        rgb_to_nv12_scalar(rgb.buf, y.buf, uv.buf, width, height, cn);
+    Py_END_ALLOW_THREADS
+
+    result = Py_None;
+    Py_INCREF(result);
+
+done:
+    PyBuffer_Release(&rgb);
+    PyBuffer_Release(&y);
+    PyBuffer_Release(&uv);
+    return result;
+}
+
+static PyMethodDef nv12_methods[] = {
+    {"nv12_to_rgb", py_nv12_to_rgb, METH_VARARGS,
+     "nv12_to_rgb(y, uv, out, width, height, channels=3)\n\n"
+     "Convert contiguous NV12 Y and UV planes into a preallocated\n"
+     "(height, width, channels) uint8 RGB or RGBA buffer (alpha = 255).\n"
+     "Releases the GIL."},
+    {"rgb_to_nv12", py_rgb_to_nv12, METH_VARARGS,
+     "rgb_to_nv12(rgb, y, uv, width, height, channels=3)\n\n"
+     "Convert a contiguous (height, width, channels) uint8 RGB or RGBA\n"
+     "buffer (alpha ignored) into preallocated NV12 Y and UV planes.\n"
+     "Releases the GIL."},
+    {NULL, NULL, 0, NULL}
+};
+
+static struct PyModuleDef nv12_module = {
+    PyModuleDef_HEAD_INIT,
+    "_nv12_rgb_avx2",
+    "Compiled NV12 <-> RGB/RGBA conversion (AVX2 with scalar fallback).",
+    -1,
+    nv12_methods
+};
+
+PyMODINIT_FUNC PyInit__nv12_rgb_avx2(void)
+{
+    return PyModule_Create(&nv12_module);
+}
@@ -50,7 +50,7 @@ Note: Width and height must be even numbers and match the original image dimensi
 
     parser.add_argument(
         '-o', '--output',
-        help='Save converted image to this path (JPG/PNG)'
+        help='Save converted image to this path (JPG/PNG, or .raw/.rgb/.bin for raw RGB bytes)'
     )
 
     parser.add_argument(
@@ -6,9 +6,59 @@ Reference: https://docs.kernel.org/userspace-api/media/v4l/pixfmt-yuv-planar.htm
 """
 
 from PIL import Image
+import functools
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from typing import Tuple
 
+from . import _kernels
+
+try:
+    from . import _nv12_rgb_avx2
+except ImportError:  # C extension not built; use Numba or NumPy instead
+    _nv12_rgb_avx2 = None
+
+
+# BT.601 full range RGB -> YUV coefficients. Kept as Python floats so the
+# float path works at the precision of its input (float32 stays float32,
+# integer channels are computed in float64)
+_CY_R = 0.299
+_CY_G = 0.587
+_CY_B = 0.114
+_CU_R = -0.168736
+_CU_G = -0.331264
+_CU_B = 0.5
+_CV_R = 0.5
+_CV_G = -0.418688
+_CV_B = -0.081312
+_C_OFFSET = 128
+
+# The same coefficients scaled by 256 (8-bit fixed point), as uint16 scalars
+# so the fast path never promotes. Negative terms are stored as magnitudes
+# and subtracted; _Q8_UV_BIAS = (128 << 8) + 127 folds in the +128 offset.
+_Q8_Y_R = np.uint16(77)
+_Q8_Y_G = np.uint16(150)
+_Q8_Y_B = np.uint16(29)
+_Q8_U_R = np.uint16(43)     # subtracted
+_Q8_U_G = np.uint16(85)     # subtracted
+_Q8_U_B = np.uint16(128)
+_Q8_V_R = np.uint16(128)
+_Q8_V_G = np.uint16(107)    # subtracted
+_Q8_V_B = np.uint16(21)     # subtracted
+_Q8_ROUND = np.uint16(128)
+_Q8_UV_BIAS = np.uint16(32895)
+_Q8_SHIFT = 8
+
+# Images shorter than this write the Y plane synchronously: handing the write
+# to a thread costs more than it overlaps with the chroma computation
+_ASYNC_WRITE_MIN_ROWS = 512
+
+
+@functools.lru_cache(maxsize=None)
+def _get_write_pool() -> ThreadPoolExecutor:
+    """Return the shared thread pool used to write the Y plane in the background."""
+    return ThreadPoolExecutor(max_workers=1)
+
 
 class DimensionError(Exception):
     """Raised when image dimensions are not even."""
@@ -44,19 +94,111 @@ def rgb_to_yuv_bt601(r: np.ndarray, g: np.ndarray, b: np.ndarray) -> Tuple[np.nd
     Returns:
         Tuple of (Y, U, V) arrays
     """
-    # BT.601 conversion matrix (full range)
-    Y = 0.299 * r + 0.587 * g + 0.114 * b
-    U = -0.168736 * r - 0.331264 * g + 0.5 * b + 128
-    V = 0.5 * r - 0.418688 * g - 0.081312 * b + 128
+    # Two float scratch buffers shared by all three channels; every step
+    # writes in place, so the only new arrays are the uint8 results
+    shape = np.broadcast(r, g, b).shape
+    dtype = np.result_type(r, g, b, _CY_R)
+    acc = np.empty(shape, dtype=dtype)
+    tmp = np.empty(shape, dtype=dtype)
+
+    rows = ((_CY_R, _CY_G, _CY_B, None),
+            (_CU_R, _CU_G, _CU_B, _C_OFFSET),
+            (_CV_R, _CV_G, _CV_B, _C_OFFSET))
+    yuv = []
+    for c_r, c_g, c_b, offset in rows:
+        # BT.601 conversion matrix row (full range)
+        np.multiply(r, c_r, out=acc)
+        np.multiply(g, c_g, out=tmp)
+        np.add(acc, tmp, out=acc)
+        np.multiply(b, c_b, out=tmp)
+        np.add(acc, tmp, out=acc)
+        if offset is not None:
+            np.add(acc, offset, out=acc)
+
+        # Clip values to valid range
+        np.clip(acc, 0, 255, out=acc)
+        yuv.append(acc.astype(np.uint8))
+    Y, U, V = yuv
+
+    return Y, U, V
+
+
+def _luma_bt601(r: np.ndarray, g: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Fixed-point BT.601 luma from uint16 channels."""
+    # Y = (77R + 150G + 29B + 128) >> 8, at most 65408
+    return ((_Q8_Y_R * r + _Q8_Y_G * g + _Q8_Y_B * b + _Q8_ROUND) >> _Q8_SHIFT).astype(np.uint8)
+
 
-    # Clip values to valid range
-    Y = np.clip(Y, 0, 255).astype(np.uint8)
-    U = np.clip(U, 0, 255).astype(np.uint8)
-    V = np.clip(V, 0, 255).astype(np.uint8)
+def _chroma_bt601(r: np.ndarray, g: np.ndarray, b: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Fixed-point BT.601 chroma from uint16 channels."""
+    # U/V = ((coef . RGB + 127) >> 8) + 128, folded into one unsigned numerator
+    # in [255, 65535]; uint16 wrap-around in the intermediate steps cancels out
+    U = ((_Q8_U_B * b + _Q8_UV_BIAS - _Q8_U_R * r - _Q8_U_G * g) >> _Q8_SHIFT).astype(np.uint8)
+    V = ((_Q8_V_R * r + _Q8_UV_BIAS - _Q8_V_G * g - _Q8_V_B * b) >> _Q8_SHIFT).astype(np.uint8)
+    return U, V
+
+
+def rgb_to_y_bt601(rgb_array: np.ndarray) -> np.ndarray:
+    """
+    Compute only the Y (luma) channel of rgb_to_yuv_bt601_fast.
+
+    Args:
+        rgb_array: RGB array of shape (..., 3), uint8 (an RGBA array also
+            works; alpha is ignored)
+
+    Returns:
+        Y uint8 array
+    """
+    return _luma_bt601(rgb_array[..., 0].astype(np.uint16),
+                       rgb_array[..., 1].astype(np.uint16),
+                       rgb_array[..., 2].astype(np.uint16))
+
+
+def rgb_to_yuv_bt601_fast(rgb_array: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Convert RGB to YUV using BT.601 standard with 8-bit fixed-point math.
+    Uses full range (0-255).
+
+    Integer counterpart of rgb_to_yuv_bt601 with coefficients scaled by 256.
+    Everything runs in uint16: U and V carry a +128 bias in the numerator so
+    intermediates never go negative, and results land in 0-255 without
+    clipping (U/V ties round down).
+
+    Args:
+        rgb_array: RGB array of shape (..., 3), uint8
+
+    Returns:
+        Tuple of (Y, U, V) uint8 arrays
+    """
+    r = rgb_array[..., 0].astype(np.uint16)
+    g = rgb_array[..., 1].astype(np.uint16)
+    b = rgb_array[..., 2].astype(np.uint16)
+
+    Y = _luma_bt601(r, g, b)
+    U, V = _chroma_bt601(r, g, b)
 
     return Y, U, V
 
 
+def rgb_to_uv_bt601(rgb_sub: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Compute only the U and V channels of rgb_to_yuv_bt601_fast.
+
+    Intended for the already subsampled RGB of an NV12 chroma plane
+    (e.g. rgb_array[::2, ::2]), so no luma is computed for it.
+
+    Args:
+        rgb_sub: RGB array of shape (..., 3), uint8 (an RGBA array also
+            works; alpha is ignored)
+
+    Returns:
+        Tuple of (U, V) uint8 arrays
+    """
+    return _chroma_bt601(rgb_sub[..., 0].astype(np.uint16),
+                         rgb_sub[..., 1].astype(np.uint16),
+                         rgb_sub[..., 2].astype(np.uint16))
+
+
 def convert_to_nv12(image_path: str, output_path: str) -> Tuple[int, int]:
     """
     Convert an image (JPG/PNG) to YUV420 NV12 format.
@@ -85,40 +227,62 @@ def convert_to_nv12(image_path: str, output_path: str) -> Tuple[int, int]:
     except Exception as e:
         raise ValueError(f"Failed to load image: {e}")
 
-    # Convert to RGB if needed
-    if img.mode != 'RGB':
+    # Convert to RGB if needed; RGBA is used as is (alpha is ignored by the
+    # conversion), which saves PIL a full-frame copy to strip it
+    if img.mode not in ('RGB', 'RGBA'):
         img = img.convert('RGB')
 
     # Get dimensions and validate
     width, height = img.size
     validate_dimensions(width, height)
 
-    # Convert to numpy array
-    rgb_array = np.array(img)
-    r = rgb_array[:, :, 0].astype(np.float32)
-    g = rgb_array[:, :, 1].astype(np.float32)
-    b = rgb_array[:, :, 2].astype(np.float32)
+    # View the decoded pixels as a (read-only) array; np.array would copy
+    # the bytes PIL already exported once more
+    rgb_array = np.asarray(img)
 
-    # Convert to YUV
-    Y, U, V = rgb_to_yuv_bt601(r, g, b)
+    y_size = width * height
+    uv_height = height // 2
+    uv_width = width // 2
 
-    # Subsample U and V to create YUV420
-    # Take average of 2x2 blocks
-    U_sub = U[::2, ::2]  # Take every other row and column
-    V_sub = V[::2, ::2]
-
-    # Create NV12 format: Y plane followed by interleaved UV plane
+    # Create NV12 format: Y plane followed by interleaved UV plane. Planes are
+    # contiguous and handed to f.write as memoryviews, so large writes go
+    # straight from the array to the OS without an intermediate copy.
     with open(output_path, 'wb') as f:
-        # Write Y plane (full resolution)
-        Y.tofile(f)
-
-        # Write interleaved UV plane (half resolution)
-        uv_height = height // 2
-        uv_width = width // 2
-        uv_interleaved = np.empty((uv_height, uv_width * 2), dtype=np.uint8)
-        uv_interleaved[:, 0::2] = U_sub
-        uv_interleaved[:, 1::2] = V_sub
-        uv_interleaved.tofile(f)
+        if _nv12_rgb_avx2 is not None or _kernels.rgb_to_nv12 is not None:
+            # Fused kernel: Y and the interleaved, subsampled UV in one pass,
+            # into a single frame buffer that is written with one call
+            nv12 = np.empty(y_size * 3 // 2, dtype=np.uint8)
+            Y = nv12[:y_size].reshape((height, width))
+            uv = nv12[y_size:].reshape((uv_height, uv_width, 2))
+            if _nv12_rgb_avx2 is not None:
+                _nv12_rgb_avx2.rgb_to_nv12(rgb_array, Y, uv, width, height, rgb_array.shape[2])
+            else:
+                with _kernels.parallel_lock:
+                    _kernels.rgb_to_nv12(rgb_array, Y, uv)
+
+            f.write(memoryview(nv12))
+        else:
+            # Full-resolution luma only; chroma is point-subsampled (top-left
+            # of each 2x2 block), so U/V are computed on the strided view alone
+            Y = rgb_to_y_bt601(rgb_array)
+
+            # Write Y plane (full resolution); for large images on a background
+            # thread while the chroma plane is computed (both release the GIL)
+            if height >= _ASYNC_WRITE_MIN_ROWS:
+                y_written = _get_write_pool().submit(f.write, memoryview(Y))
+            else:
+                f.write(memoryview(Y))
+                y_written = None
+
+            U_sub, V_sub = rgb_to_uv_bt601(rgb_array[::2, ::2])
+            uv = np.empty((uv_height, uv_width, 2), dtype=np.uint8)
+            uv[..., 0] = U_sub
+            uv[..., 1] = V_sub
+            if y_written is not None:
+                y_written.result()
+
+            # Write interleaved UV plane (half resolution)
+            f.write(memoryview(uv))
 
     return width, height
 
@@ -132,17 +296,24 @@ def get_file_info(yuv_path: str) -> dict:
 
     Returns:
         Dictionary with file information
+
+    Raises:
+        FileNotFoundError: If YUV file doesn't exist
     """
     import os
-    file_size = os.path.getsize(yuv_path)
+
+    try:
+        file_size = os.stat(yuv_path).st_size
+    except FileNotFoundError:
+        raise FileNotFoundError(f"YUV file not found: {yuv_path}")
 
     # Calculate possible dimensions
     # NV12 size = width * height * 1.5
-    # So: width * height = file_size / 1.5
-    pixels = file_size / 1.5
+    # So: width * height = file_size * 2 / 3
+    pixels = file_size * 2 // 3
 
     return {
         'file_size': file_size,
-        'total_pixels': int(pixels),
+        'total_pixels': pixels,
         'format': 'YUV420 NV12'
     }
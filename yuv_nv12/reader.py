@@ -4,58 +4,260 @@ YUV NV12 Reader and Visualizer Module
 Reads YUV420 NV12 binary files and converts them back to displayable images.
 """
 
+import functools
 import numpy as np
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from PIL import Image
-from typing import Tuple
+from typing import Iterator, Optional, Tuple, Union
 
+try:
+    from turbojpeg import TurboJPEG, TJSAMP_420
+except ImportError:  # PyTurboJPEG is optional; JPEG output goes through PIL
+    TurboJPEG = None
+    TJSAMP_420 = None
 
-def yuv_to_rgb_bt601(Y: np.ndarray, U: np.ndarray, V: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+from . import _kernels
+from ._kernels import _Q16_SHIFT, _Q16_ROUND, _Q16_R_V, _Q16_G_U, _Q16_G_V, _Q16_B_U
+
+try:
+    from . import _nv12_rgb_avx2
+except ImportError:  # C extension not built; use Numba or NumPy instead
+    _nv12_rgb_avx2 = None
+
+
+# Output extensions written as headerless interleaved RGB bytes
+_RAW_RGB_EXTENSIONS = ('.raw', '.rgb', '.bin')
+
+# zlib level PIL uses for PNG by default, passed to OpenCV's encoder to match
+_PNG_COMPRESS_LEVEL = 6
+
+# Frames shorter than this many rows per stripe are converted on one thread
+_STRIPE_MIN_ROWS = 64
+
+
+def _chroma_offsets_bt601(U: np.ndarray, V: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Compute the BT.601 R, G and B offsets that get added to Y.
+
+    Computed in Q16 and rounded, so Y + offset is exactly the Q16 result.
+    Offsets lie within [-227, 226] and are returned as int16.
+
+    Args:
+        U, V: Chroma arrays (uint8, any matching shape)
+
+    Returns:
+        Tuple of (R, G, B) offset arrays (int16)
+    """
+    Uq = U.astype(np.int32)
+    np.subtract(Uq, 128, out=Uq)
+    Vq = V.astype(np.int32)
+    np.subtract(Vq, 128, out=Vq)
+    acc = np.empty(np.broadcast(Uq, Vq).shape, dtype=np.int32)
+
+    np.multiply(Vq, _Q16_R_V, out=acc)
+    np.add(acc, _Q16_ROUND, out=acc)
+    np.right_shift(acc, _Q16_SHIFT, out=acc)
+    R = acc.astype(np.int16)
+
+    np.multiply(Uq, _Q16_B_U, out=acc)
+    np.add(acc, _Q16_ROUND, out=acc)
+    np.right_shift(acc, _Q16_SHIFT, out=acc)
+    B = acc.astype(np.int16)
+
+    np.multiply(Uq, _Q16_G_U, out=acc)
+    np.multiply(Vq, _Q16_G_V, out=Vq)
+    np.add(acc, Vq, out=acc)
+    np.add(acc, _Q16_ROUND, out=acc)
+    np.right_shift(acc, _Q16_SHIFT, out=acc)
+    G = acc.astype(np.int16)
+
+    return R, G, B
+
+
+def yuv_to_rgb_bt601(Y: np.ndarray, U: np.ndarray, V: np.ndarray,
+                     out_rgb: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
     """
     Convert YUV to RGB using BT.601 standard (inverse of conversion).
     Uses full range (0-255).
 
     Args:
-        Y, U, V: YUV color channel arrays
+        Y, U, V: YUV color channel arrays (broadcastable against each other)
+        out_rgb: Optional uint8 array of shape (..., 3) or (..., 4) to write
+            R, G and B into (channels 0-2); extra channels are left untouched
 
     Returns:
-        Tuple of (R, G, B) arrays
+        Tuple of (R, G, B) arrays (views into out_rgb when given)
     """
-    # Convert to float for calculation
-    Y = Y.astype(np.float32)
-    U = U.astype(np.float32) - 128
-    V = V.astype(np.float32) - 128
+    # Full range Y needs no bias or scaling: keep it at 8 bits and add the
+    # int16 chroma offsets (fixed-point, no float intermediates). The offsets
+    # are products in Q16 rather than Q8: 359 * 127 already overflows int16,
+    # and Q8 coefficients are off by one for some inputs.
+    Yi = Y.astype(np.int16)
+    offsets = _chroma_offsets_bt601(U, V)
+    shape = np.broadcast(Yi, offsets[0]).shape
+    if out_rgb is None:
+        out_rgb = np.empty(shape + (3,), dtype=np.uint8)
+
+    # One int16 scratch buffer shared by all three channels
+    acc = np.empty(shape, dtype=np.int16)
+    for c, offset in enumerate(offsets):
+        np.add(Yi, offset, out=acc)
+        np.clip(acc, 0, 255, out=acc)
+        out_rgb[..., c] = acc
+
+    return out_rgb[..., 0], out_rgb[..., 1], out_rgb[..., 2]
+
+
+@functools.lru_cache(maxsize=None)
+def _get_stripe_pool() -> ThreadPoolExecutor:
+    """Return the shared thread pool used for stripe-parallel conversion."""
+    import os
 
-    # BT.601 inverse conversion
-    R = Y + 1.402 * V
-    G = Y - 0.344136 * U - 0.714136 * V
-    B = Y + 1.772 * U
+    return ThreadPoolExecutor(max_workers=os.cpu_count())
 
-    # Clip values to valid range
-    R = np.clip(R, 0, 255).astype(np.uint8)
-    G = np.clip(G, 0, 255).astype(np.uint8)
-    B = np.clip(B, 0, 255).astype(np.uint8)
 
-    return R, G, B
+def _nv12_stripe_to_rgb(Y: np.ndarray, uv_data: np.ndarray, out: np.ndarray) -> None:
+    """
+    Convert a band of NV12 rows to RGB(A) with NumPy, writing into out.
+
+    Args:
+        Y: Y rows of the band (even row count x width, uint8, C-contiguous)
+        uv_data: Matching interleaved UV rows (half the row count x width)
+        out: Matching RGB(A) rows (row count x width x 3 or 4, C-contiguous);
+            with 4 channels alpha is set to 255
+    """
+    uv_height = uv_data.shape[0]
+    uv_width = uv_data.shape[1] // 2
 
+    # De-interleave UV into contiguous half resolution planes
+    uv_pairs = uv_data.reshape((uv_height, uv_width, 2))
+    U_sub = uv_pairs[:, :, 0].copy()
+    V_sub = uv_pairs[:, :, 1].copy()
 
-def read_nv12(yuv_path: str, width: int, height: int) -> Image.Image:
+    # View Y and the output as 2x2 blocks (uv_h, 2, uv_w, 2) so the half
+    # resolution chroma broadcasts over each block without being upsampled
+    blocks = (uv_height, 2, uv_width, 2)
+    yuv_to_rgb_bt601(Y.reshape(blocks), U_sub[:, None, :, None], V_sub[:, None, :, None],
+                     out_rgb=out.reshape(blocks + (out.shape[2],)))
+    if out.shape[2] == 4:
+        out[:, :, 3] = 255
+
+
+@functools.lru_cache(maxsize=8)
+def _make_nv12_decoder(width: int, height: int, channels: int):
     """
-    Read a YUV420 NV12 binary file and convert to RGB image.
+    Build an NV12 -> RGB(A) frame converter specialized for one frame size.
 
-    NV12 format layout:
-    - Y plane: full resolution (width x height)
-    - UV plane: interleaved U and V, half resolution (width x height/2)
+    Plane offsets and shapes and the NumPy path's stripe layout are worked
+    out once and captured by the returned closure, so a stream of frames of
+    the same size skips that per-call setup. The closure holds no mutable
+    state and can run on several threads at once; parallel Numba launches
+    are serialized through _kernels.parallel_lock.
+
+    Returns:
+        Function decode(buf, parallel, out) -> (height, width, channels) array
+    """
+    import os
+
+    y_size = width * height
+    uv_height = height // 2
+    y_shape = (height, width)
+    uv_shape = (uv_height, width)
+    rgb_shape = (height, width, channels)
+
+    # Horizontal stripes for the NumPy path, split on even rows so chroma
+    # pairs are never divided; small frames stay single-threaded where
+    # dispatch overhead would dominate
+    stripes = min(os.cpu_count() or 1, height // _STRIPE_MIN_ROWS)
+    rows = [2 * (uv_height * k // stripes) for k in range(stripes + 1)] if stripes > 1 else []
+    bands = list(zip(rows[:-1], rows[1:]))
+
+    def decode(buf: np.ndarray, parallel: bool, out: Optional[np.ndarray]) -> np.ndarray:
+        # Y plane (full resolution) and interleaved UV plane (half resolution)
+        Y = buf[:y_size].reshape(y_shape)
+        uv_data = buf[y_size:].reshape(uv_shape)
+
+        # Interleaved RGB(A) output, written in place (alpha included) by
+        # every conversion path
+        rgb_array = np.empty(rgb_shape, dtype=np.uint8) if out is None else out
+
+        if _nv12_rgb_avx2 is not None:
+            # Compiled kernel (AVX2 when the CPU supports it)
+            _nv12_rgb_avx2.nv12_to_rgb(Y, uv_data, rgb_array, width, height, channels)
+        elif _kernels.nv12_to_rgb is not None:
+            # Fused kernel: upsample and convert in a single pass
+            if parallel:
+                with _kernels.parallel_lock:
+                    _kernels.nv12_to_rgb(Y, uv_data, rgb_array)
+            else:
+                _kernels.nv12_to_rgb_serial(Y, uv_data, rgb_array)
+        elif parallel and bands:
+            # Stripes on threads (NumPy releases the GIL)
+            futures = [_get_stripe_pool().submit(_nv12_stripe_to_rgb, Y[y0:y1],
+                                                 uv_data[y0 // 2:y1 // 2], rgb_array[y0:y1])
+                       for y0, y1 in bands]
+            for future in futures:
+                future.result()
+        else:
+            _nv12_stripe_to_rgb(Y, uv_data, rgb_array)
+
+        return rgb_array
+
+    return decode
+
+
+def _nv12_to_rgb_array(buf: np.ndarray, width: int, height: int, channels: int = 3,
+                       parallel: bool = True, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Convert one flat NV12 frame buffer to an interleaved RGB(A) array.
+
+    Dispatches through the cached, size-specialized _make_nv12_decoder.
+
+    Args:
+        buf: Flat uint8 frame of width*height*1.5 bytes
+        width: Image width (must be even)
+        height: Image height (must be even)
+        channels: 3 for RGB, 4 for RGBA (alpha = 255)
+        parallel: Allow the Numba kernel (or the NumPy path's stripes) to use
+            several threads. Pass False when the caller already converts
+            frames on several threads.
+        out: Optional preallocated C-contiguous (height, width, channels)
+            uint8 array to write into
+
+    Returns:
+        uint8 array of shape (height, width, channels)
+    """
+    return _make_nv12_decoder(width, height, channels)(buf, parallel, out)
+
+
+def _rgb_array_to_image(rgb_array: np.ndarray, mode: str) -> Image.Image:
+    """
+    Wrap a C-contiguous interleaved RGB(A) array as a PIL Image.
+
+    RGBA matches PIL's 4-byte pixel layout, so the buffer is shared (PIL keeps
+    a reference to it). RGB is repacked by PIL into 4-byte pixels, which
+    costs the one unavoidable copy.
+    """
+    height, width = rgb_array.shape[:2]
+    return Image.frombuffer(mode, (width, height), rgb_array, 'raw', mode, 0, 1)
+
+
+def _load_nv12_frame(yuv_path: str, width: int, height: int, mmap: bool = True) -> np.ndarray:
+    """
+    Validate a single-frame NV12 file and load it as a flat uint8 buffer.
 
     Args:
         yuv_path: Path to YUV NV12 file
         width: Image width (must be even)
         height: Image height (must be even)
+        mmap: Memory-map the file instead of reading it into RAM
 
     Returns:
-        PIL Image in RGB format
+        Flat uint8 array of width*height*1.5 bytes (a read-only memmap if mmap)
 
     Raises:
-        ValueError: If dimensions are invalid or file size doesn't match
+        ValueError: If the path looks like an image, or dimensions or file size are invalid
         FileNotFoundError: If YUV file doesn't exist
     """
     import os
@@ -74,70 +276,376 @@ def read_nv12(yuv_path: str, width: int, height: int) -> Image.Image:
         raise ValueError(f"Dimensions must be even numbers. Got {width}x{height}")
 
     # Calculate expected file size
-    expected_size = int(width * height * 1.5)  # Y + UV/2
+    expected_size = width * height * 3 // 2  # Y + UV/2
 
-    # Check file exists and size
-    if not os.path.exists(yuv_path):
+    # Check file exists and size with a single stat() call
+    try:
+        file_size = os.stat(yuv_path).st_size
+    except FileNotFoundError:
         raise FileNotFoundError(f"YUV file not found: {yuv_path}")
 
-    file_size = os.path.getsize(yuv_path)
     if file_size != expected_size:
         raise ValueError(
             f"File size mismatch. Expected {expected_size} bytes for {width}x{height}, "
             f"but got {file_size} bytes. Please verify the dimensions are correct."
         )
 
-    # Read binary file
-    with open(yuv_path, 'rb') as f:
-        # Read Y plane (full resolution)
-        y_size = width * height
-        Y = np.frombuffer(f.read(y_size), dtype=np.uint8).reshape((height, width))
+    # Map (or read) the whole file in one go and slice the planes out as
+    # views; the size check above guards the mapping against truncation
+    if mmap:
+        buf = np.memmap(yuv_path, dtype=np.uint8, mode='r', shape=(expected_size,))
+    else:
+        buf = np.fromfile(yuv_path, dtype=np.uint8, count=expected_size)
+
+    return buf
+
 
-        # Read interleaved UV plane (half resolution)
-        uv_height = height // 2
-        uv_width = width // 2
-        uv_size = uv_width * uv_height * 2
-        uv_data = np.frombuffer(f.read(uv_size), dtype=np.uint8).reshape((uv_height, uv_width * 2))
+def read_nv12(yuv_path: str, width: int, height: int, backend: str = 'cpu',
+              mode: str = 'RGB', mmap: bool = True,
+              as_array: bool = False) -> Union[Image.Image, np.ndarray]:
+    """
+    Read a YUV420 NV12 binary file and convert to RGB image.
+
+    With mode='RGBA' every pixel is 4 bytes (alpha = 255), which keeps the
+    conversion stores aligned and lets PIL wrap the buffer without a copy.
+    Call .convert('RGB') on the result if a 3-channel image is needed.
+
+    NV12 format layout:
+    - Y plane: full resolution (width x height)
+    - UV plane: interleaved U and V, half resolution (width x height/2)
+
+    Args:
+        yuv_path: Path to YUV NV12 file
+        width: Image width (must be even)
+        height: Image height (must be even)
+        backend: 'cpu' (Numba/NumPy) or 'cuda' (CuPy, requires a GPU)
+        mode: Output image mode, 'RGB' or 'RGBA'
+        mmap: Memory-map the file (default) so the planes are zero-copy
+            views and pages are loaded on demand while the conversion runs.
+            Pass False to read the file into RAM with a single np.fromfile.
+        as_array: Return the (height, width, channels) uint8 ndarray instead
+            of a PIL Image, skipping the copy into PIL's storage
 
-        # De-interleave UV
-        U_sub = uv_data[:, 0::2]
-        V_sub = uv_data[:, 1::2]
+    Returns:
+        PIL Image in RGB (or RGBA) format, or a uint8 ndarray if as_array
 
-    # Upsample U and V to full resolution
-    # Repeat each pixel in 2x2 blocks
-    U = np.repeat(np.repeat(U_sub, 2, axis=0), 2, axis=1)
-    V = np.repeat(np.repeat(V_sub, 2, axis=0), 2, axis=1)
+    Raises:
+        ValueError: If dimensions, backend, mode or file size are invalid
+        FileNotFoundError: If YUV file doesn't exist
+        ImportError: If backend is 'cuda' and CuPy is not installed
+    """
+    if backend not in ('cpu', 'cuda'):
+        raise ValueError(f"Unknown backend '{backend}'. Expected 'cpu' or 'cuda'.")
 
-    # Convert YUV to RGB
-    R, G, B = yuv_to_rgb_bt601(Y, U, V)
+    if mode not in ('RGB', 'RGBA'):
+        raise ValueError(f"Unsupported mode '{mode}'. Expected 'RGB' or 'RGBA'.")
+    channels = len(mode)
 
-    # Create RGB image
-    rgb_array = np.stack([R, G, B], axis=2)
-    img = Image.fromarray(rgb_array, 'RGB')
+    buf = _load_nv12_frame(yuv_path, width, height, mmap)
 
-    return img
+    if backend == 'cuda':
+        from .reader_cuda import nv12_to_rgb_cuda, cupy
+        rgb_gpu = nv12_to_rgb_cuda(buf, width, height, channels)
+        rgb_array = cupy.asnumpy(rgb_gpu)
+    else:
+        rgb_array = _nv12_to_rgb_array(buf, width, height, channels)
+
+    if as_array:
+        return rgb_array
+
+    return _rgb_array_to_image(rgb_array, mode)
+
+
+def read_nv12_stream(yuv_path: str, width: int, height: int, num_frames: Optional[int] = None,
+                     max_workers: Optional[int] = None, mode: str = 'RGB') -> Iterator[Image.Image]:
+    """
+    Read consecutive NV12 frames from a raw video file.
+
+    The file is memory-mapped and frames are converted on a thread pool
+    (the compiled and Numba kernels release the GIL), so the next frames
+    are decoded while the caller handles the current one. Frames are
+    yielded in file order.
+
+    Args:
+        yuv_path: Path to a file of back-to-back NV12 frames
+        width: Frame width (must be even)
+        height: Frame height (must be even)
+        num_frames: Number of frames to read (default: every full frame in the file)
+        max_workers: Number of conversion threads (default: CPU count)
+        mode: Output image mode, 'RGB' or 'RGBA'
+
+    Returns:
+        Iterator of PIL Images, one per frame
+
+    Raises:
+        ValueError: If dimensions, frame count or mode are invalid, or the file
+            holds fewer frames
+        FileNotFoundError: If YUV file doesn't exist
+    """
+    import os
+
+    num_frames = _count_nv12_frames(yuv_path, width, height, num_frames, mode)
+    max_workers = max_workers or os.cpu_count() or 1
+    return _iter_nv12_frames(yuv_path, width, height, num_frames, max_workers, mode)
+
+
+def _count_nv12_frames(yuv_path: str, width: int, height: int, num_frames: Optional[int],
+                       mode: str) -> int:
+    """Validate multi-frame read arguments and return the number of frames to read."""
+    import os
+
+    if width <= 0 or height <= 0:
+        raise ValueError(f"Dimensions must be positive. Got {width}x{height}")
+
+    if width % 2 != 0 or height % 2 != 0:
+        raise ValueError(f"Dimensions must be even numbers. Got {width}x{height}")
+
+    if num_frames is not None and num_frames < 0:
+        raise ValueError(f"Number of frames must be non-negative. Got {num_frames}")
+
+    if mode not in ('RGB', 'RGBA'):
+        raise ValueError(f"Unsupported mode '{mode}'. Expected 'RGB' or 'RGBA'.")
+
+    try:
+        file_size = os.stat(yuv_path).st_size
+    except FileNotFoundError:
+        raise FileNotFoundError(f"YUV file not found: {yuv_path}")
+
+    frame_size = width * height * 3 // 2
+    available = file_size // frame_size
+    if num_frames is None:
+        return available
+    if num_frames > available:
+        raise ValueError(
+            f"Requested {num_frames} frames, but {yuv_path} only holds {available} "
+            f"full frames of {width}x{height}."
+        )
+    return num_frames
+
+
+def _iter_nv12_frames(yuv_path: str, width: int, height: int, num_frames: int,
+                      max_workers: int, mode: str) -> Iterator[Image.Image]:
+    """Generator behind read_nv12_stream (arguments already validated)."""
+    if num_frames == 0:
+        return
+
+    frame_size = width * height * 3 // 2
+    channels = len(mode)
+    buf = np.memmap(yuv_path, dtype=np.uint8, mode='r', shape=(num_frames * frame_size,))
+
+    pool = ThreadPoolExecutor(max_workers=max_workers)
+    pending = deque()
+    try:
+        for i in range(num_frames):
+            frame = buf[i * frame_size:(i + 1) * frame_size]
+            pending.append(pool.submit(_nv12_to_rgb_array, frame, width, height, channels, False))
+
+            # Bound the number of decoded frames held in memory
+            if len(pending) > 2 * max_workers:
+                yield _rgb_array_to_image(pending.popleft().result(), mode)
+
+        while pending:
+            yield _rgb_array_to_image(pending.popleft().result(), mode)
+    finally:
+        # Consumer stopped early: drop frames that haven't started yet
+        for future in pending:
+            future.cancel()
+        pool.shutdown(wait=True)
+
+
+def read_nv12_batch(yuv_path: str, width: int, height: int, num_frames: Optional[int] = None,
+                    mode: str = 'RGB') -> np.ndarray:
+    """
+    Read consecutive NV12 frames from a raw video file into one array.
+
+    The file is memory-mapped and all frames are converted together: the
+    Numba kernel covers every frame in a single parallel launch, otherwise
+    frames are converted concurrently on a shared thread pool. This avoids
+    the per-call overhead of read_nv12 for many small frames.
+
+    Args:
+        yuv_path: Path to a file of back-to-back NV12 frames
+        width: Frame width (must be even)
+        height: Frame height (must be even)
+        num_frames: Number of frames to read (default: every full frame in the file)
+        mode: Output channel layout, 'RGB' or 'RGBA'
+
+    Returns:
+        uint8 array of shape (num_frames, height, width, 3) (or 4 for 'RGBA')
+
+    Raises:
+        ValueError: If dimensions, frame count or mode are invalid, or the file
+            holds fewer frames
+        FileNotFoundError: If YUV file doesn't exist
+    """
+    import os
+
+    num_frames = _count_nv12_frames(yuv_path, width, height, num_frames, mode)
+    channels = len(mode)
+
+    rgb_frames = np.empty((num_frames, height, width, channels), dtype=np.uint8)
+    if num_frames == 0:
+        return rgb_frames
+
+    y_size = width * height
+    frame_size = y_size * 3 // 2
+    frames = np.memmap(yuv_path, dtype=np.uint8, mode='r', shape=(num_frames, frame_size))
+
+    if _nv12_rgb_avx2 is None and _kernels.nv12_to_rgb_batch is not None:
+        with _kernels.parallel_lock:
+            _kernels.nv12_to_rgb_batch(frames[:, :y_size].reshape((num_frames, height, width)),
+                                       frames[:, y_size:].reshape((num_frames, height // 2, width)),
+                                       rgb_frames)
+    else:
+        # Contiguous runs of frames per thread (the compiled and NumPy paths
+        # release the GIL); a single CPU converts them inline
+        workers = min(os.cpu_count() or 1, num_frames)
+        if workers > 1:
+            bounds = [num_frames * k // workers for k in range(workers + 1)]
+            futures = [_get_stripe_pool().submit(_nv12_frames_to_rgb, frames[a:b], width, height,
+                                                 rgb_frames[a:b])
+                       for a, b in zip(bounds[:-1], bounds[1:])]
+            for future in futures:
+                future.result()
+        else:
+            _nv12_frames_to_rgb(frames, width, height, rgb_frames)
+
+    return rgb_frames
+
+
+def _nv12_frames_to_rgb(frames: np.ndarray, width: int, height: int, out: np.ndarray) -> None:
+    """Convert each row of frames (one flat NV12 frame) into the matching out[i]."""
+    channels = out.shape[3]
+    for i in range(frames.shape[0]):
+        _nv12_to_rgb_array(frames[i], width, height, channels, False, out[i])
+
+
+@functools.lru_cache(maxsize=None)
+def _get_turbojpeg():
+    """Return a shared TurboJPEG encoder, or None if libjpeg-turbo isn't available."""
+    if TurboJPEG is None:
+        return None
+    try:
+        return TurboJPEG()
+    except Exception:  # Python bindings present but the shared library is missing
+        return None
+
+
+def _write_jpeg_from_nv12(buf: np.ndarray, width: int, height: int, output_path: str) -> bool:
+    """
+    Encode a flat NV12 frame straight to JPEG with libjpeg-turbo, if available.
+
+    JPEG stores BT.601 full range YCbCr 4:2:0 natively, so the planes are
+    handed over as-is: no YUV -> RGB -> YUV round trip and no second chroma
+    subsampling.
+
+    Returns:
+        True if the JPEG was written, False if the caller should fall back to PIL
+    """
+    jpeg = _get_turbojpeg()
+    # TurboJPEG pads planar rows to 4 bytes; only take unpadded layouts
+    if jpeg is None or width % 8 != 0:
+        return False
+
+    y_size = width * height
+    uv_pairs = buf[y_size:].reshape((height // 2, width // 2, 2))
+
+    # NV12 -> I420 (Y, then U plane, then V plane)
+    i420 = np.concatenate((buf[:y_size], uv_pairs[:, :, 0].ravel(), uv_pairs[:, :, 1].ravel()))
+
+    # quality=75 matches PIL's JPEG default
+    data = jpeg.encode_from_yuv(i420, height, width, quality=75, jpeg_subsample=TJSAMP_420)
+    with open(output_path, 'wb') as f:
+        f.write(data)
+    return True
+
+
+@functools.lru_cache(maxsize=None)
+def _get_cv2():
+    """Import OpenCV on first use (it is slow to import), or None if missing."""
+    try:
+        import cv2
+    except ImportError:  # OpenCV is optional; images are saved through PIL
+        return None
+    return cv2
+
+
+def _write_png_cv2(rgb_array: np.ndarray, output_path: str) -> bool:
+    """
+    Encode an RGB array as PNG with OpenCV, if available.
+
+    OpenCV's encoder works on the ndarray directly, so no PIL image or PIL
+    working buffer is needed. The zlib level is set to PIL's default, since
+    OpenCV's own (1) writes noticeably larger files. Other formats stay with
+    PIL, whose encoder defaults OpenCV doesn't share (e.g. WebP would become
+    lossless).
+
+    Returns:
+        True if the file was written, False if the caller should fall back
+        to PIL (OpenCV missing or failing)
+    """
+    cv2 = _get_cv2()
+    if cv2 is None:
+        return False
+
+    try:
+        return bool(cv2.imwrite(output_path, cv2.cvtColor(rgb_array, cv2.COLOR_RGB2BGR),
+                                [cv2.IMWRITE_PNG_COMPRESSION, _PNG_COMPRESS_LEVEL]))
+    except cv2.error:
+        return False
 
 
 def visualize_nv12(yuv_path: str, width: int, height: int, output_path: str = None, show: bool = True) -> Image.Image:
     """
     Visualize a YUV NV12 file by converting to RGB and optionally saving/displaying.
 
+    Files are written from the converted array (PNG through OpenCV when it
+    is installed, else PIL); use read_nv12(..., as_array=True) when only the
+    pixel data is needed.
+
     Args:
         yuv_path: Path to YUV NV12 file
         width: Image width
         height: Image height
-        output_path: Optional path to save the RGB image
+        output_path: Optional path to save the RGB image. Extensions .raw,
+            .rgb and .bin are written as headerless interleaved RGB bytes.
+            JPEG output is encoded from the YUV planes when PyTurboJPEG is
+            installed, and PNG output uses OpenCV when available
         show: Whether to display the image (requires display)
 
     Returns:
         PIL Image in RGB format
     """
-    img = read_nv12(yuv_path, width, height)
+    import os
+
+    # The frame is loaded once; the JPEG path encodes it as is and the RGB
+    # conversion (needed for the returned image) reads the same buffer
+    buf = _load_nv12_frame(yuv_path, width, height)
+    out_ext = os.path.splitext(output_path)[1].lower() if output_path else None
+
+    # JPEG is YCbCr already: encode the NV12 planes directly when possible
+    jpeg_written = (out_ext in ('.jpg', '.jpeg')
+                    and _write_jpeg_from_nv12(buf, width, height, output_path))
+
+    rgb_array = _nv12_to_rgb_array(buf, width, height)
+    img = None
 
     if output_path:
-        img.save(output_path)
+        # Raw dumps don't need PIL's format dispatch or an encoder
+        if out_ext in _RAW_RGB_EXTENSIONS:
+            rgb_array.tofile(output_path)
+        elif jpeg_written:
+            pass
+        elif out_ext == '.png' and _write_png_cv2(rgb_array, output_path):
+            pass
+        else:
+            img = _rgb_array_to_image(rgb_array, 'RGB')
+            img.save(output_path)
         print(f"Saved RGB image to: {output_path}")
 
+    if img is None:
+        img = _rgb_array_to_image(rgb_array, 'RGB')
+
     if show:
         try:
             img.show()
@@ -160,10 +668,11 @@ def get_nv12_info(yuv_path: str) -> dict:
     """
     import os
 
-    if not os.path.exists(yuv_path):
+    try:
+        file_size = os.stat(yuv_path).st_size
+    except FileNotFoundError:
         raise FileNotFoundError(f"File not found: {yuv_path}")
 
-    file_size = os.path.getsize(yuv_path)
     file_ext = os.path.splitext(yuv_path)[1].lower()
 
     # Check if file is an image format
@@ -201,21 +710,22 @@ def get_nv12_info(yuv_path: str) -> dict:
     # It's a YUV file
     # Calculate total pixels
     # NV12 size = width * height * 1.5
-    total_pixels = file_size / 1.5
+    total_pixels = file_size * 2 // 3
 
-    # Suggest possible dimensions (common aspect ratios)
+    # Suggest possible dimensions (common aspect ratios); a valid NV12 size
+    # is a multiple of 3, so exact integer divisibility is all that's needed
     possible_dims = []
-    for width in range(2, 10000, 2):  # Even numbers only
-        height = total_pixels / width
-        if height == int(height) and height % 2 == 0:
-            possible_dims.append((width, int(height)))
-            if len(possible_dims) >= 10:  # Limit suggestions
-                break
+    if file_size % 3 == 0:
+        widths = np.arange(2, 10000, 2, dtype=np.int64)  # Even numbers only
+        widths = widths[total_pixels % widths == 0]
+        heights = total_pixels // widths
+        valid = (heights % 2 == 0) & (heights > 0)
+        possible_dims = list(zip(widths[valid].tolist(), heights[valid].tolist()))[:10]  # Limit suggestions
 
     return {
         'file_path': yuv_path,
         'file_size': file_size,
-        'total_pixels': int(total_pixels),
+        'total_pixels': total_pixels,
         'format': 'YUV420 NV12',
         'suggested_dimensions': possible_dims[:5] if possible_dims else []
     }
@@ -0,0 +1,75 @@
+"""
+YUV NV12 CUDA Reader Module
+
+Converts YUV420 NV12 frames to RGB on the GPU using CuPy.
+"""
+
+import numpy as np
+
+try:
+    import cupy
+except ImportError:  # cupy is optional; only needed for backend='cuda'
+    cupy = None
+
+from ._kernels import _Q16_SHIFT, _Q16_ROUND, _Q16_R_V, _Q16_G_U, _Q16_G_V, _Q16_B_U
+
+
+if cupy is not None:
+    # One thread per output pixel, BT.601 full range with Q16 coefficients
+    _nv12_to_rgb_kernel = cupy.ElementwiseKernel(
+        'raw uint8 Y, raw uint8 UV, int32 width, int32 channels',
+        'raw uint8 rgb',
+        f'''
+        int row = i / width;
+        int col = i - row * width;
+        int uv = (row >> 1) * width + (col & ~1);
+        int u = (int)UV[uv] - 128;
+        int v = (int)UV[uv + 1] - 128;
+        int y = ((int)Y[i] << {_Q16_SHIFT}) + {_Q16_ROUND};
+
+        int r = (y + ({_Q16_R_V}) * v) >> {_Q16_SHIFT};
+        int g = (y + ({_Q16_G_U}) * u + ({_Q16_G_V}) * v) >> {_Q16_SHIFT};
+        int b = (y + ({_Q16_B_U}) * u) >> {_Q16_SHIFT};
+
+        int p = channels * i;
+        rgb[p] = min(max(r, 0), 255);
+        rgb[p + 1] = min(max(g, 0), 255);
+        rgb[p + 2] = min(max(b, 0), 255);
+        if (channels == 4) rgb[p + 3] = 255;
+        ''',
+        'nv12_to_rgb'
+    )
+
+
+def nv12_to_rgb_cuda(buf, width: int, height: int, channels: int = 3):
+    """
+    Convert an NV12 frame to interleaved RGB (or RGBA) on the GPU.
+
+    Args:
+        buf: Flat NV12 frame (NumPy or CuPy uint8 array of width*height*1.5
+             bytes). CuPy arrays are used in place without a host copy.
+        width: Image width (must be even)
+        height: Image height (must be even)
+        channels: 3 for RGB, 4 for RGBA (alpha = 255)
+
+    Returns:
+        CuPy uint8 array of shape (height, width, channels)
+
+    Raises:
+        ImportError: If CuPy is not installed
+    """
+    if cupy is None:
+        raise ImportError(
+            "CuPy is required for the CUDA backend. "
+            "Install it with 'pip install cupy-cuda12x' (matching your CUDA version)."
+        )
+
+    buf = cupy.asarray(buf, dtype=cupy.uint8)
+    y_size = width * height
+    Y = buf[:y_size]
+    UV = buf[y_size:]
+
+    rgb = cupy.empty((height, width, channels), dtype=cupy.uint8)
+    _nv12_to_rgb_kernel(Y, UV, np.int32(width), np.int32(channels), rgb, size=y_size)
+
+    return rgb